@@ -1,12 +1,20 @@
 import os
-import json
+import re
+import heapq
+import asyncio
 import httpx
+import orjson
 from datetime import datetime, date
-from calendar import monthrange
+from calendar import IllegalMonthError, monthrange
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from operator import itemgetter
 from mcp.server.fastmcp import FastMCP
 
 
-def get_finnish_public_holidays(year: int) -> list[date]:
+@lru_cache(maxsize=32)
+def get_finnish_public_holidays(year: int) -> frozenset[date]:
     """Get Finnish public holidays for a given year."""
     from datetime import timedelta
 
@@ -24,49 +32,62 @@ def get_finnish_public_holidays(year: int) -> list[date]:
     ]
 
     # Easter-based holidays (calculate Easter Sunday)
-    # Using Anonymous Gregorian algorithm
+    # Using Lichtenberg's formula, which yields Easter as a day offset from
+    # March 22 (the earliest possible date) so that all Easter-relative
+    # holidays can be derived from a single ordinal
+    k = year // 100
+    m = 15 + (3 * k + 3) // 4 - (8 * k + 13) // 25
+    s = 2 - (3 * k + 3) // 4
     a = year % 19
-    b = year // 100
-    c = year % 100
-    d = b // 4
-    e = b % 4
-    f = (b + 8) // 25
-    g = (b - f + 1) // 3
-    h = (19 * a + b - d - g + 15) % 30
-    i = c // 4
-    k = c % 4
-    l = (32 + 2 * e + 2 * i - h - k) % 7
-    m = (a + 11 * h + 22 * l) // 451
-    month = (h + l - 7 * m + 114) // 31
-    day = ((h + l - 7 * m + 114) % 31) + 1
-    easter = date(year, month, day)
+    d = (19 * a + m) % 30
+    r = (d + a // 11) // 29
+    full_moon = 21 + d - r
+    first_sunday = 7 - (year + year // 4 + s) % 7
+    offset = full_moon + 7 - (full_moon - first_sunday) % 7 - 22
+    easter = date(year, 3, 22).toordinal() + offset
 
     holidays.extend([
-        easter - timedelta(days=2),   # Good Friday
-        easter,                        # Easter Sunday
-        easter + timedelta(days=1),    # Easter Monday
-        easter + timedelta(days=39),   # Ascension Day
+        date.fromordinal(easter - 2),   # Good Friday
+        date.fromordinal(easter),       # Easter Sunday
+        date.fromordinal(easter + 1),   # Easter Monday
+        date.fromordinal(easter + 39),  # Ascension Day
     ])
 
-    return holidays
+    return frozenset(holidays)
 
 
-def count_working_days(year: int, month: int) -> int:
-    """Count working days in a month (weekdays minus public holidays)."""
-    holidays = get_finnish_public_holidays(year)
-    _, days_in_month = monthrange(year, month)
+def _count_month_working_days(year: int, month: int, holidays: frozenset[date]) -> int:
+    """Count weekdays in a month that are not in ``holidays``."""
+    first_weekday, days_in_month = monthrange(year, month)
+
+    # Every full week contributes five weekdays (0=Mon, 6=Sun); only the
+    # leftover days at the end of the month need checking individually.
+    full_weeks, extra_days = divmod(days_in_month, 7)
+    weekdays = full_weeks * 5 + sum(
+        1 for i in range(extra_days) if (first_weekday + i) % 7 < 5
+    )
 
-    working_days = 0
-    for day in range(1, days_in_month + 1):
-        d = date(year, month, day)
-        # Weekday (0=Mon, 6=Sun) and not a holiday
-        if d.weekday() < 5 and d not in holidays:
-            working_days += 1
+    weekday_holidays = sum(
+        1 for d in holidays if d.month == month and d.weekday() < 5
+    )
 
-    return working_days
+    return weekdays - weekday_holidays
 
-# Initialize FastMCP server
-mcp = FastMCP("harvest-api")
+
+@lru_cache(maxsize=8)
+def _year_working_days(year: int) -> tuple[int, ...]:
+    """Working days for each month of a year, January first."""
+    holidays = get_finnish_public_holidays(year)
+    return tuple(
+        _count_month_working_days(year, month, holidays) for month in range(1, 13)
+    )
+
+
+def count_working_days(year: int, month: int) -> int:
+    """Count working days in a month (weekdays minus public holidays)."""
+    if not 1 <= month <= 12:
+        raise IllegalMonthError(month)
+    return _year_working_days(year)[month - 1]
 
 # Get environment variables for Harvest API
 HARVEST_ACCOUNT_ID = os.environ.get("HARVEST_ACCOUNT_ID")
@@ -78,30 +99,157 @@ if not HARVEST_ACCOUNT_ID or not HARVEST_API_KEY:
         "Missing Harvest API credentials. Set HARVEST_ACCOUNT_ID and HARVEST_API_KEY environment variables."
     )
 
+HARVEST_BASE_URL = "https://api.harvestapp.com/v2/"
+HARVEST_HEADERS = {
+    "Harvest-Account-Id": HARVEST_ACCOUNT_ID,
+    "Authorization": f"Bearer {HARVEST_API_KEY}",
+    "User-Agent": "Harvest MCP Server",
+    "Content-Type": "application/json",
+}
+
+
+# Shared Harvest API client, opened for the server's lifetime so every tool
+# call reuses pooled keep-alive connections instead of paying a new TCP/TLS
+# handshake.
+_CLIENT: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared Harvest API client, creating it if needed."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            base_url=HARVEST_BASE_URL,
+            headers=HARVEST_HEADERS,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _CLIENT
+
+
+@asynccontextmanager
+async def harvest_lifespan(server):
+    """Open the shared client on server startup and close it on shutdown."""
+    global _CLIENT
+    client = _get_client()
+    try:
+        yield
+    finally:
+        await client.aclose()
+        _CLIENT = None
 
-# Helper function to make Harvest API requests
-async def harvest_request(path, params=None, method="GET"):
-    headers = {
-        "Harvest-Account-Id": HARVEST_ACCOUNT_ID,
-        "Authorization": f"Bearer {HARVEST_API_KEY}",
-        "User-Agent": "Harvest MCP Server",
-        "Content-Type": "application/json",
+
+# Initialize FastMCP server
+mcp = FastMCP("harvest-api", lifespan=harvest_lifespan)
+
+
+_BOOL_PARAMS = {True: "true", False: "false"}
+
+
+def _encode_params(**kwargs):
+    """Build Harvest query parameters, dropping unset (None) values.
+
+    Booleans are sent as "true"/"false"; other values are left for httpx to
+    stringify.
+    """
+    return {
+        key: _BOOL_PARAMS[value] if isinstance(value, bool) else value
+        for key, value in kwargs.items()
+        if value is not None
     }
 
-    url = f"https://api.harvestapp.com/v2/{path}"
 
-    async with httpx.AsyncClient() as client:
-        if method == "GET":
-            response = await client.get(url, headers=headers, params=params)
-        else:
-            response = await client.request(method, url, headers=headers, json=params)
+# Caps how many Harvest requests are in flight at once when tools fan out.
+_REQUEST_SEMAPHORE = asyncio.Semaphore(8)
+
+# How often a rate-limited (429) request is retried before giving up.
+_RATE_LIMIT_RETRIES = 3
+
+
+def _retry_after(response) -> float:
+    """Seconds to wait before retrying a rate-limited response."""
+    try:
+        return max(float(response.headers.get("Retry-After", 1)), 0)
+    except ValueError:
+        return 1.0
+
 
-        if response.status_code not in (200, 201):
+# Helper function to make Harvest API requests
+async def harvest_request(path, params=None, method="GET"):
+    for attempt in range(_RATE_LIMIT_RETRIES + 1):
+        async with _REQUEST_SEMAPHORE:
+            response = await _get_client().request(
+                method,
+                path,
+                params=params if method == "GET" else None,
+                json=None if method == "GET" else params,
+            )
+
+        if response.status_code != 429:
+            break
+        if attempt == _RATE_LIMIT_RETRIES:
             raise Exception(
-                f"Harvest API Error: {response.status_code} {response.text}"
+                f"Harvest API rate limit exceeded: {response.status_code} {response.text}"
             )
 
-        return response.json()
+        # Rate limited: wait as long as Harvest asks, outside the semaphore
+        # so other requests are not held up by the wait
+        await asyncio.sleep(_retry_after(response))
+
+    if response.status_code not in (200, 201):
+        raise Exception(
+            f"Harvest API Error: {response.status_code} {response.text}"
+        )
+
+    return orjson.loads(response.content)
+
+
+async def harvest_request_paginated(path, key, params=None, max_pages=None):
+    """Fetch the pages of a Harvest list endpoint.
+
+    The first page reports ``total_pages``; the remaining pages, up to
+    ``max_pages`` in total when given, are then requested concurrently and
+    their records under ``key`` concatenated in page order.
+
+    Returns the records and Harvest's ``total_entries`` for the whole query,
+    which exceeds the number of records when ``max_pages`` cut the fetch short.
+    """
+    params = dict(params or {})
+
+    first = await harvest_request(path, {**params, "page": 1})
+    items = list(first.get(key, []))
+
+    total_pages = first.get("total_pages") or 1
+    if max_pages is not None:
+        total_pages = min(total_pages, max_pages)
+    rest = await asyncio.gather(
+        *(
+            harvest_request(path, {**params, "page": page})
+            for page in range(2, total_pages + 1)
+        )
+    )
+    for response in rest:
+        items.extend(response.get(key, []))
+
+    return items, first.get("total_entries", len(items))
+
+
+async def harvest_request_many(path, ids):
+    """Fetch ``{path}/{id}`` for each ID concurrently.
+
+    Results are returned in the order of ``ids``; a failed lookup is reported
+    as ``{"id": ..., "error": ...}`` instead of failing the whole batch.
+    """
+    responses = await asyncio.gather(
+        *(harvest_request(f"{path}/{item_id}") for item_id in ids),
+        return_exceptions=True,
+    )
+    return [
+        {"id": item_id, "error": str(response)}
+        if isinstance(response, Exception)
+        else response
+        for item_id, response in zip(ids, responses)
+    ]
 
 
 @mcp.tool()
@@ -113,20 +261,14 @@ async def list_users(is_active: bool = None, page: int = None, per_page: int = N
         page: The page number for pagination
         per_page: The number of records to return per page (1-2000)
     """
-    params = {}
-    if is_active is not None:
-        params["is_active"] = "true" if is_active else "false"
-    else:
-        params["is_active"] = "true"
-    if page is not None:
-        params["page"] = str(page)
-    if per_page is not None:
-        params["per_page"] = str(per_page)
-    else:
-        params["per_page"] = 200
+    params = _encode_params(
+        is_active=True if is_active is None else is_active,
+        page=page,
+        per_page=per_page or 200,
+    )
 
     response = await harvest_request("users", params)
-    return json.dumps(response, indent=2)
+    return orjson.dumps(response).decode()
 
 
 @mcp.tool()
@@ -137,7 +279,23 @@ async def get_user_details(user_id: int):
         user_id: The ID of the user to retrieve
     """
     response = await harvest_request(f"users/{user_id}")
-    return json.dumps(response, indent=2)
+    return orjson.dumps(response).decode()
+
+
+@mcp.tool()
+async def get_users_details(user_ids: list[int]):
+    """Retrieve details for several users at once.
+
+    Args:
+        user_ids: The IDs of the users to retrieve
+    """
+    response = await harvest_request_many("users", user_ids)
+    return orjson.dumps(response).decode()
+
+
+# Upper bound on the pages list_time_entries fetches, so an unbounded query
+# cannot pull an account's whole history into one response.
+_LIST_TIME_ENTRIES_MAX_PAGES = 5
 
 
 @mcp.tool()
@@ -150,6 +308,12 @@ async def list_time_entries(
 ):
     """List time entries with optional filtering.
 
+    Follows Harvest pagination for up to 10,000 entries (five pages of 2000).
+    Unlike Harvest's paged response, the result carries no page or links
+    metadata: it has ``time_entries``, ``total_entries`` (the count of all
+    matching entries) and ``truncated``, which is true when more entries
+    matched than were returned; narrow the date range to get the rest.
+
     Args:
         user_id: Filter by user ID
         from_date: Only return time entries with a spent_date on or after the given date (YYYY-MM-DD)
@@ -157,20 +321,27 @@ async def list_time_entries(
         is_running: Pass true to only return running time entries and false to return non-running time entries
         is_billable: Pass true to only return billable time entries and false to return non-billable time entries
     """
-    params = {}
-    if user_id is not None:
-        params["user_id"] = str(user_id)
-    if from_date is not None:
-        params["from"] = from_date
-    if to_date is not None:
-        params["to"] = to_date
-    if is_running is not None:
-        params["is_running"] = "true" if is_running else "false"
-    if is_billable is not None:
-        params["is_billable"] = "true" if is_billable else "false"
+    params = _encode_params(
+        user_id=user_id,
+        to=to_date,
+        is_running=is_running,
+        is_billable=is_billable,
+        per_page=2000,
+        **{"from": from_date},
+    )
 
-    response = await harvest_request("time_entries", params)
-    return json.dumps(response, indent=2)
+    entries, total_entries = await harvest_request_paginated(
+        "time_entries",
+        "time_entries",
+        params,
+        max_pages=_LIST_TIME_ENTRIES_MAX_PAGES,
+    )
+    response = {
+        "time_entries": entries,
+        "total_entries": total_entries,
+        "truncated": len(entries) < total_entries,
+    }
+    return orjson.dumps(response).decode()
 
 
 @mcp.tool()
@@ -197,7 +368,7 @@ async def create_time_entry(
         params["notes"] = notes
 
     response = await harvest_request("time_entries", params, method="POST")
-    return json.dumps(response, indent=2)
+    return orjson.dumps(response).decode()
 
 
 @mcp.tool()
@@ -210,7 +381,7 @@ async def stop_timer(time_entry_id: int):
     response = await harvest_request(
         f"time_entries/{time_entry_id}/stop", method="PATCH"
     )
-    return json.dumps(response, indent=2)
+    return orjson.dumps(response).decode()
 
 
 @mcp.tool()
@@ -231,7 +402,7 @@ async def update_time_entry(time_entry_id: int, hours: float = None, notes: str
     response = await harvest_request(
         f"time_entries/{time_entry_id}", params, method="PATCH"
     )
-    return json.dumps(response, indent=2)
+    return orjson.dumps(response).decode()
 
 
 @mcp.tool()
@@ -254,7 +425,7 @@ async def start_timer(project_id: int, task_id: int, notes: str = None):
         params["notes"] = notes
 
     response = await harvest_request("time_entries", params, method="POST")
-    return json.dumps(response, indent=2)
+    return orjson.dumps(response).decode()
 
 
 @mcp.tool()
@@ -265,14 +436,10 @@ async def list_projects(client_id: int = None, is_active: bool = None):
         client_id: Filter by client ID
         is_active: Pass true to only return active projects and false to return inactive projects
     """
-    params = {}
-    if client_id is not None:
-        params["client_id"] = str(client_id)
-    if is_active is not None:
-        params["is_active"] = "true" if is_active else "false"
+    params = _encode_params(client_id=client_id, is_active=is_active)
 
     response = await harvest_request("projects", params)
-    return json.dumps(response, indent=2)
+    return orjson.dumps(response).decode()
 
 
 @mcp.tool()
@@ -283,7 +450,18 @@ async def get_project_details(project_id: int):
         project_id: The ID of the project to retrieve
     """
     response = await harvest_request(f"projects/{project_id}")
-    return json.dumps(response, indent=2)
+    return orjson.dumps(response).decode()
+
+
+@mcp.tool()
+async def get_projects_details(project_ids: list[int]):
+    """Get detailed information about several projects at once.
+
+    Args:
+        project_ids: The IDs of the projects to retrieve
+    """
+    response = await harvest_request_many("projects", project_ids)
+    return orjson.dumps(response).decode()
 
 
 @mcp.tool()
@@ -293,12 +471,10 @@ async def list_clients(is_active: bool = None):
     Args:
         is_active: Pass true to only return active clients and false to return inactive clients
     """
-    params = {}
-    if is_active is not None:
-        params["is_active"] = "true" if is_active else "false"
+    params = _encode_params(is_active=is_active)
 
     response = await harvest_request("clients", params)
-    return json.dumps(response, indent=2)
+    return orjson.dumps(response).decode()
 
 
 @mcp.tool()
@@ -309,7 +485,18 @@ async def get_client_details(client_id: int):
         client_id: The ID of the client to retrieve
     """
     response = await harvest_request(f"clients/{client_id}")
-    return json.dumps(response, indent=2)
+    return orjson.dumps(response).decode()
+
+
+@mcp.tool()
+async def get_clients_details(client_ids: list[int]):
+    """Get detailed information about several clients at once.
+
+    Args:
+        client_ids: The IDs of the clients to retrieve
+    """
+    response = await harvest_request_many("clients", client_ids)
+    return orjson.dumps(response).decode()
 
 
 @mcp.tool()
@@ -319,12 +506,10 @@ async def list_tasks(is_active: bool = None):
     Args:
         is_active: Pass true to only return active tasks and false to return inactive tasks
     """
-    params = {}
-    if is_active is not None:
-        params["is_active"] = "true" if is_active else "false"
+    params = _encode_params(is_active=is_active)
 
     response = await harvest_request("tasks", params)
-    return json.dumps(response, indent=2)
+    return orjson.dumps(response).decode()
 
 
 @mcp.tool()
@@ -347,44 +532,117 @@ async def get_unsubmitted_timesheets(
         page: The page number for pagination
         per_page: The number of records to return per page (1-2000)
     """
-    params = {}
-    if user_id is not None:
-        params["user_id"] = str(user_id)
-    if from_date is not None:
-        params["from"] = from_date
-    if to_date is not None:
-        params["to"] = to_date
-    if page is not None:
-        params["page"] = str(page)
-    if per_page is not None:
-        params["per_page"] = str(per_page)
-    else:
-        params["per_page"] = "200"
-
-    # Get all time entries first
+    params = _encode_params(
+        user_id=user_id,
+        to=to_date,
+        page=page,
+        per_page=per_page or 200,
+        **{"from": from_date},
+    )
+
+    # Harvest has no query filter for is_closed, so fetch and filter here
     response = await harvest_request("time_entries", params)
-    
-    # Filter for unsubmitted entries (those that are not closed)
-    unsubmitted_entries = []
-    if "time_entries" in response:
-        for entry in response["time_entries"]:
-            # Time entries that are not closed are considered unsubmitted
-            if not entry.get("is_closed", False):
-                unsubmitted_entries.append(entry)
-    
-    # Create a response structure similar to the original API response
-    filtered_response = {
-        "time_entries": unsubmitted_entries,
-        "per_page": response.get("per_page", len(unsubmitted_entries)),
-        "total_pages": 1,  # Simplified since we're filtering client-side
-        "total_entries": len(unsubmitted_entries),
-        "next_page": None,
-        "previous_page": None,
-        "page": response.get("page", 1),
-        "links": response.get("links", {})
+
+    # Time entries that are not closed are considered unsubmitted
+    unsubmitted_entries = [
+        entry
+        for entry in response.get("time_entries", [])
+        if not entry.get("is_closed", False)
+    ]
+
+    # Rewrite the page metadata to describe the filtered result; the links
+    # would still point at Harvest's unfiltered pages, so they are cleared
+    response["time_entries"] = unsubmitted_entries
+    response["total_entries"] = len(unsubmitted_entries)
+    response.update(total_pages=1, next_page=None, previous_page=None, links={})
+
+    return orjson.dumps(response).decode()
+
+
+# Task name keywords used to categorize time entries, compiled once so each
+# entry is matched by the regex engine instead of per-keyword substring scans.
+_HOLIDAY_RE = re.compile(r"public holiday|arkipyhä|holiday")
+_ABSENCE_RE = re.compile(r"unpaid absence|palkaton")
+_LEAVE_RE = re.compile(r"day-off|flextime|saldo|vacation|loma|sick|sairas")
+
+# Union of all category keywords. Most entries are ordinary work whose task
+# name matches none of them, so one scan with this settles those entries
+# before the per-category patterns are tried in priority order.
+_ANY_CATEGORY_RE = re.compile(
+    "|".join(pattern.pattern for pattern in (_HOLIDAY_RE, _ABSENCE_RE, _LEAVE_RE))
+)
+
+# Shared read-only default for missing nested objects (task, client) in entries.
+_EMPTY = {}
+
+# Time entry categories, as indexes into the per-category hour totals.
+_ACTUAL_WORK, _PUBLIC_HOLIDAY, _PAID_LEAVE, _UNPAID_ABSENCE = range(4)
+
+
+# A month's entries repeat a small set of task names, so each distinct name is
+# classified only once.
+@lru_cache(maxsize=1024)
+def _classify_task(task_name: str) -> int:
+    """Return the category of a time entry from its task name."""
+    task_name = task_name.casefold()
+    if not _ANY_CATEGORY_RE.search(task_name):
+        return _ACTUAL_WORK
+    if _HOLIDAY_RE.search(task_name):
+        return _PUBLIC_HOLIDAY
+    if _ABSENCE_RE.search(task_name):
+        return _UNPAID_ABSENCE
+    if _LEAVE_RE.search(task_name):
+        return _PAID_LEAVE
+    return _ACTUAL_WORK
+
+
+def _monthly_work_summary(
+    year, month, hours_per_day, work_time_percentage, category_hours, by_client, top_clients
+):
+    """Build the get_monthly_work_percentage result from aggregated hours.
+
+    ``category_hours`` holds the hours per category code and ``by_client``
+    the actual work hours per client name.
+    """
+    working_days = count_working_days(year, month)
+    full_time_hours = working_days * hours_per_day
+
+    actual_work_hours, public_holiday_hours, paid_leave_hours, unpaid_absence_hours = category_hours
+    # Public holidays excluded from total since already in expected_hours
+    total_hours = actual_work_hours + paid_leave_hours
+
+    # Calculate expected hours (adjusted for part-time and unpaid absence)
+    expected_hours = (full_time_hours - unpaid_absence_hours) * work_time_percentage / 100
+
+    # Calculate percentages
+    work_percentage = (total_hours / expected_hours * 100) if expected_hours > 0 else 0
+
+    # Clients with the most actual work first, optionally only the top ones
+    clients = heapq.nlargest(
+        len(by_client) if top_clients is None else top_clients,
+        by_client.items(),
+        key=itemgetter(1),
+    )
+
+    return {
+        "period": f"{year}-{month:02d}",
+        "working_days": working_days,
+        "hours_per_day": hours_per_day,
+        "work_time_percentage": work_time_percentage,
+        "expected_hours": round(expected_hours, 2),
+        "summary": {
+            "total_logged_hours": round(total_hours, 2),
+            "unpaid_absence_hours": round(unpaid_absence_hours, 2),
+            "work_percentage": round(work_percentage, 1),
+        },
+        "breakdown": {
+            "actual_work": round(actual_work_hours, 2),
+            "public_holidays": round(public_holiday_hours, 2),
+            "paid_leave": round(paid_leave_hours, 2),
+            "unpaid_absence": round(unpaid_absence_hours, 2),
+        },
+        "by_client": {k: round(v, 2) for k, v in clients},
     }
-    
-    return json.dumps(filtered_response, indent=2)
 
 
 @mcp.tool()
@@ -393,6 +651,7 @@ async def get_monthly_work_percentage(
     month: int,
     hours_per_day: float = 7.5,
     work_time_percentage: float = HARVEST_WORK_PERCENTAGE,
+    top_clients: int = None,
 ):
     """Calculate work percentage for a given month compared to full-time.
 
@@ -404,91 +663,40 @@ async def get_monthly_work_percentage(
         month: The month (1-12)
         hours_per_day: Hours per working day (default 7.5 for Finland)
         work_time_percentage: Part-time percentage (default from HARVEST_WORK_PERCENTAGE env var, or 100)
+        top_clients: Only list this many clients with the most actual work hours (default: all clients)
     """
     # Fetch time entries for the month
     from_date = f"{year}-{month:02d}-01"
     _, last_day = monthrange(year, month)
     to_date = f"{year}-{month:02d}-{last_day:02d}"
 
-    params = {"from": from_date, "to": to_date, "per_page": "2000"}
-    response = await harvest_request("time_entries", params)
+    params = {"from": from_date, "to": to_date, "per_page": 2000}
+    entries, _ = await harvest_request_paginated("time_entries", "time_entries", params)
 
-    entries = response.get("time_entries", [])
-
-    # Categorize entries based on task name
-    absence_keywords = ["unpaid absence", "palkaton"]
-    holiday_keywords = ["public holiday", "arkipyhä", "holiday"]
-    leave_keywords = ["day-off", "flextime", "saldo", "vacation", "loma", "sick", "sairas"]
-
-    total_hours = 0.0
-    actual_work_hours = 0.0
-    public_holiday_hours = 0.0
-    paid_leave_hours = 0.0
-    unpaid_absence_hours = 0.0
-
-    by_client = {}
-    by_category = {
-        "actual_work": 0.0,
-        "public_holiday": 0.0,
-        "paid_leave": 0.0,
-        "unpaid_absence": 0.0,
-    }
+    # Summarize with the same code path whether or not anything was logged
+    summary_args = (year, month, hours_per_day, work_time_percentage)
 
-    for entry in entries:
-        hours = entry.get("hours", 0)
-        task_name = entry.get("task", {}).get("name", "").lower()
-        client_name = entry.get("client", {}).get("name", "Unknown")
-
-        # Categorize (public holidays excluded from total since already in expected_hours)
-        if any(kw in task_name for kw in holiday_keywords):
-            public_holiday_hours += hours
-            by_category["public_holiday"] += hours
-        elif any(kw in task_name for kw in absence_keywords):
-            unpaid_absence_hours += hours
-            by_category["unpaid_absence"] += hours
-        elif any(kw in task_name for kw in leave_keywords):
-            total_hours += hours
-            paid_leave_hours += hours
-            by_category["paid_leave"] += hours
-        else:
-            total_hours += hours
-            actual_work_hours += hours
-            by_category["actual_work"] += hours
-
-            # Track by client for actual work only
-            if client_name not in by_client:
-                by_client[client_name] = 0.0
-            by_client[client_name] += hours
+    if not entries:
+        # Nothing logged for the month, so there is nothing to aggregate
+        result = _monthly_work_summary(*summary_args, [0.0] * 4, {}, top_clients)
+        return orjson.dumps(result).decode()
 
-    # Calculate expected hours (adjusted for part-time and unpaid absence)
-    working_days = count_working_days(year, month)
-    full_time_hours = working_days * hours_per_day
-    expected_hours = (full_time_hours - unpaid_absence_hours) * work_time_percentage / 100
+    category_hours = [0.0] * 4
+    by_client = defaultdict(float)
 
-    # Calculate percentages
-    work_percentage = (total_hours / expected_hours * 100) if expected_hours > 0 else 0
+    for entry in entries:
+        hours = entry.get("hours", 0)
+        task = entry.get("task") or _EMPTY
+        category = _classify_task(task.get("name", ""))
+        category_hours[category] += hours
 
-    result = {
-        "period": f"{year}-{month:02d}",
-        "working_days": working_days,
-        "hours_per_day": hours_per_day,
-        "work_time_percentage": work_time_percentage,
-        "expected_hours": round(expected_hours, 2),
-        "summary": {
-            "total_logged_hours": round(total_hours, 2),
-            "unpaid_absence_hours": round(unpaid_absence_hours, 2),
-            "work_percentage": round(work_percentage, 1),
-        },
-        "breakdown": {
-            "actual_work": round(actual_work_hours, 2),
-            "public_holidays": round(public_holiday_hours, 2),
-            "paid_leave": round(paid_leave_hours, 2),
-            "unpaid_absence": round(unpaid_absence_hours, 2),
-        },
-        "by_client": {k: round(v, 2) for k, v in sorted(by_client.items(), key=lambda x: -x[1])},
-    }
+        # Track by client for actual work only
+        if category == _ACTUAL_WORK:
+            client = entry.get("client") or _EMPTY
+            by_client[client.get("name", "Unknown")] += hours
 
-    return json.dumps(result, indent=2)
+    result = _monthly_work_summary(*summary_args, category_hours, by_client, top_clients)
+    return orjson.dumps(result).decode()
 
 
 if __name__ == "__main__":